@@ -10,36 +10,20 @@ Run: python check_ebay_usage.py
 """
 
 import os
+import time
 import base64
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from ebay_limits import parse_browse_remaining
+from ebay_token_cache import get_cached_token, store_token
+from env_loader import load_env_from_dotenv
 
-def _load_env_from_dotenv() -> None:
-    """Load env from server/.env or .env (same as scrape_vinted.py)."""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    for path in [
-        os.path.join(base_dir, "server", ".env"),
-        os.path.join(base_dir, ".env"),
-    ]:
-        if not os.path.exists(path):
-            continue
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-                    key, value = line.split("=", 1)
-                    key, value = key.strip(), value.strip()
-                    if key and key not in os.environ:
-                        os.environ[key] = value
-        except Exception as e:
-            print(f"Warning: could not load {path}: {e}")
-        break
 
-
-_load_env_from_dotenv()
+load_env_from_dotenv()
 
 EBAY_CLIENT_ID = os.getenv("EBAY_CLIENT_ID")
 EBAY_CLIENT_SECRET = os.getenv("EBAY_CLIENT_SECRET")
@@ -54,6 +38,22 @@ USER_RATE_LIMIT_URL = f"{EBAY_ANALYTICS_BASE}/user_rate_limit/"
 # Optional: set in .env to check user-level limits (from OAuth authorization code flow).
 EBAY_REFRESH_TOKEN = os.getenv("EBAY_REFRESH_TOKEN", "").strip()
 
+# Keep-alive session with retries (same setup as scrape_catawiki.py)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
 # Only Browse API (Buy) — same as scrapers' item_summary/search for sport card
 BROWSE_PARAMS = {"api_name": "browse", "api_context": "buy"}
 
@@ -62,9 +62,13 @@ def get_app_token() -> str:
     """OAuth client_credentials grant — same as scrape_vinted.get_ebay_access_token()."""
     if not EBAY_CLIENT_ID or not EBAY_CLIENT_SECRET:
         raise RuntimeError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
+    cached_token = get_cached_token()
+    if cached_token:
+        return cached_token
+    now = time.time()
     basic = f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode("utf-8")
     auth_header = "Basic " + base64.b64encode(basic).decode("ascii")
-    resp = requests.post(
+    resp = _SESSION.post(
         EBAY_TOKEN_URL,
         headers={
             "Content-Type": "application/x-www-form-urlencoded",
@@ -75,7 +79,10 @@ def get_app_token() -> str:
     )
     if not resp.ok:
         raise RuntimeError(f"eBay app token failed: {resp.status_code} {resp.text}")
-    return resp.json()["access_token"]
+    data = orjson.loads(resp.content)
+    token = data["access_token"]
+    store_token(token, data.get("expires_in", 7200), now)
+    return token
 
 
 def get_user_token(refresh_token: str) -> str:
@@ -84,7 +91,7 @@ def get_user_token(refresh_token: str) -> str:
         raise RuntimeError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
     basic = f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode("utf-8")
     auth_header = "Basic " + base64.b64encode(basic).decode("ascii")
-    resp = requests.post(
+    resp = _SESSION.post(
         EBAY_TOKEN_URL,
         headers={
             "Content-Type": "application/x-www-form-urlencoded",
@@ -99,12 +106,12 @@ def get_user_token(refresh_token: str) -> str:
     )
     if not resp.ok:
         raise RuntimeError(f"eBay user token failed: {resp.status_code} {resp.text}")
-    return resp.json()["access_token"]
+    return orjson.loads(resp.content)["access_token"]
 
 
 def fetch_rate_limit(url: str, token: str, params: dict | None = None) -> dict:
     """GET rate_limit or user_rate_limit and return JSON."""
-    r = requests.get(
+    r = _SESSION.get(
         url,
         headers={"Authorization": f"Bearer {token}"},
         params=params or {},
@@ -114,7 +121,7 @@ def fetch_rate_limit(url: str, token: str, params: dict | None = None) -> dict:
         return {}
     if not r.ok:
         raise RuntimeError(f"eBay analytics request failed: {r.status_code} {r.text}")
-    return r.json()
+    return orjson.loads(r.content)
 
 
 def print_usage(label: str, data: dict) -> None:
@@ -159,6 +166,7 @@ def main() -> None:
         print("\nToken (OAuth client_credentials, same as scrapers):", app_token)
         app_data = fetch_rate_limit(RATE_LIMIT_URL, app_token, params=BROWSE_PARAMS)
         print_usage("Application rate_limit/ (client credentials)", app_data)
+        print(f"\n  Browse calls remaining: {parse_browse_remaining(app_data)}")
     except Exception as e:
         print("\n--- Application rate_limit/ ---")
         print(f"Error: {e}")
@@ -0,0 +1,60 @@
+"""
+Process-wide limits on eBay Browse calls.
+
+run_both_scrapers.py runs the Vinted and Catawiki scrapers at the same time.
+Both hold an EBAY_SEMAPHORE slot around every Browse request, so together they
+never have more than EBAY_MAX_CONCURRENT calls in flight. Threaded callers
+also space their requests with wait_for_ebay_slot(). parse_browse_remaining()
+reads the Analytics rate_limit response all three scripts check.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+
+
+EBAY_MAX_CONCURRENT = 8
+EBAY_SEMAPHORE = threading.BoundedSemaphore(EBAY_MAX_CONCURRENT)
+
+# Minimum spacing between requests started via wait_for_ebay_slot (5 req/s)
+EBAY_MIN_INTERVAL = 0.2
+
+_rate_lock = threading.Lock()
+_next_slot = 0.0
+
+
+def wait_for_ebay_slot() -> None:
+    """Block until this thread may start its next eBay request."""
+    global _next_slot
+    with _rate_lock:
+        now = time.monotonic()
+        delay = _next_slot - now
+        _next_slot = max(now, _next_slot) + EBAY_MIN_INTERVAL
+    if delay > 0:
+        time.sleep(delay)
+
+
+@contextlib.asynccontextmanager
+async def ebay_slot_async():
+    """Hold one EBAY_SEMAPHORE slot from async code without blocking the event loop."""
+    # Poll instead of acquiring in a worker thread, so a cancelled task can
+    # never end up holding a slot it will not release
+    while not EBAY_SEMAPHORE.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        yield
+    finally:
+        EBAY_SEMAPHORE.release()
+
+
+def parse_browse_remaining(data: dict) -> int:
+    """Smallest `remaining` across all rates in a rate_limit response (0 if none)."""
+    remaining = None
+    for api in data.get("rateLimits") or []:
+        for res in api.get("resources") or []:
+            for rate in res.get("rates") or []:
+                r = rate.get("remaining")
+                if r is not None:
+                    remaining = min(remaining, r) if remaining is not None else r
+    return int(remaining) if remaining is not None else 0
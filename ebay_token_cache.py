@@ -0,0 +1,108 @@
+"""
+On-disk cache of the eBay application (client_credentials) token.
+
+Shared by scrape_vinted.py, scrape_catawiki.py and check_ebay_usage.py so a
+restart, or another script, reuses a still-valid token instead of doing a new
+OAuth round-trip. The file holds {"token": ..., "expiry": <unix time>}; the
+current token is also kept in memory for the life of the process.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+EBAY_TOKEN_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".ebay_token_cache.json"
+)
+
+# Treat a token as expired this many seconds before eBay does
+EBAY_TOKEN_EXPIRY_MARGIN = 60.0
+
+_token = None
+_token_expiry = 0.0
+_token_state_lock = threading.Lock()
+
+
+def load_token_cache() -> tuple[str | None, float]:
+    """Return (token, expiry) from the on-disk token cache, or (None, 0.0)."""
+    try:
+        with open(EBAY_TOKEN_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("token"), float(data.get("expiry") or 0.0)
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None, 0.0
+
+
+def save_token_cache(token: str, expiry: float) -> None:
+    """Atomically write the token cache, readable by the owner only."""
+    # A private temp file per writer, so concurrent scripts never share one
+    cache_dir = os.path.dirname(EBAY_TOKEN_CACHE_PATH)
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_dir, prefix=".ebay_token_cache.", suffix=".tmp"
+        )
+    except OSError as e:
+        print(f"Warning: could not write eBay token cache: {e}")
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"token": token, "expiry": expiry}, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, EBAY_TOKEN_CACHE_PATH)
+    except OSError as e:
+        print(f"Warning: could not write eBay token cache: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def clear_token_cache() -> None:
+    """Delete the cached token, e.g. after eBay rejected it with a 401."""
+    try:
+        os.remove(EBAY_TOKEN_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def get_cached_token() -> str | None:
+    """
+    Return a token with more than EBAY_TOKEN_EXPIRY_MARGIN seconds left,
+    from memory or else from disk (saved by a previous run or another
+    script); None if a new one must be fetched.
+    """
+    global _token, _token_expiry
+    now = time.time()
+    with _token_state_lock:
+        if _token and now < _token_expiry:
+            return _token
+    cached_token, cached_expiry = load_token_cache()
+    if cached_token and now < cached_expiry - EBAY_TOKEN_EXPIRY_MARGIN:
+        with _token_state_lock:
+            _token = cached_token
+            _token_expiry = cached_expiry - EBAY_TOKEN_EXPIRY_MARGIN
+        return cached_token
+    return None
+
+
+def store_token(token: str | None, expires_in: float, now: float) -> None:
+    """Remember a freshly fetched token (obtained at `now`) in memory and on disk."""
+    global _token, _token_expiry
+    if not token:
+        return
+    with _token_state_lock:
+        _token = token
+        _token_expiry = now + float(expires_in) - EBAY_TOKEN_EXPIRY_MARGIN
+    save_token_cache(token, now + float(expires_in))
+
+
+def invalidate_token() -> None:
+    """Forget the cached token (memory and disk), e.g. after a 401."""
+    global _token, _token_expiry
+    with _token_state_lock:
+        _token = None
+        _token_expiry = 0.0
+    clear_token_cache()
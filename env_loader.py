@@ -0,0 +1,52 @@
+"""
+Load the Node server's .env (server/.env, else .env) into os.environ.
+
+Shared by scrape_vinted.py, scrape_catawiki.py and check_ebay_usage.py so the
+Python scripts use the same config (Mongo URI, eBay keys, Vinted search, etc.).
+The file is parsed once per process, however many of them are imported.
+Existing environment variables are NOT overridden.
+"""
+
+import functools
+import os
+import re
+
+try:
+    from dotenv import dotenv_values
+except ImportError:  # python-dotenv not installed; use the plain parser below
+    dotenv_values = None
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CANDIDATE_PATHS = [
+    os.path.join(BASE_DIR, "server", ".env"),
+    os.path.join(BASE_DIR, ".env"),
+]
+
+# KEY=value lines; blank lines, comments and anything else simply don't match
+_ENV_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$", re.MULTILINE)
+
+
+def _parse_env_file(path: str) -> dict[str, str]:
+    if dotenv_values is not None:
+        return {k: v for k, v in dotenv_values(path).items() if v is not None}
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return {m.group(1): m.group(2) for m in _ENV_RE.finditer(text)}
+
+
+@functools.lru_cache(maxsize=1)
+def load_env_from_dotenv() -> None:
+    for path in CANDIDATE_PATHS:
+        if not os.path.exists(path):
+            continue
+        try:
+            values = _parse_env_file(path)
+            os.environ.update(
+                {k: v for k, v in values.items() if k and k not in os.environ}
+            )
+        except Exception as e:
+            print(f"Warning: could not load env file {path}: {e}")
+        # Stop at the first .env we find
+        break
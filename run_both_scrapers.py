@@ -1,5 +1,5 @@
 """
-Run both scrapers on one machine: Vinted first, then Catawiki, then sleep 3 hours.
+Run both scrapers on one machine: Vinted and Catawiki side by side, then sleep 3 hours.
 Use this instead of running scrape_vinted.py and scrape_catawiki.py separately.
 
   python run_both_scrapers.py
@@ -8,13 +8,21 @@ Flow each cycle:
   1. Check eBay buy.browse remaining (once).
   2. If remaining <= 0: skip both, do not update last-update times, sleep 3h.
   3. Else:
-     - Save vintedLastUpdate (start time), run Vinted scrape.
-     - Save catawikiLastUpdate (start time), run Catawiki scrape.
+     - Save vintedLastUpdate and catawikiLastUpdate (start time).
+     - Run the Vinted and Catawiki scrapes concurrently (different hosts);
+       together they keep at most ebay_limits.EBAY_MAX_CONCURRENT eBay calls
+       in flight. A failure in one does not stop the other.
      - Sleep 3 hours.
   4. Repeat.
+
+Vinted pages come from its JSON API. If the API refuses us, they are loaded
+by up to VINTED_BROWSER_WORKERS pool processes, each running its own Chrome
+(this process never starts one). The pool and its browsers are reused by every
+cycle and shut down when the process exits.
 """
 
 import time
+from concurrent.futures import ALL_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 
 # Import after env is loaded by each module (they both load server/.env)
@@ -25,19 +33,7 @@ import scrape_catawiki
 SLEEP_SECONDS = 3 * 60 * 60  # 3 hours
 
 
-def run_cycle():
-    start = datetime.now(timezone.utc)
-    print(f"[Both] Starting cycle at {start.isoformat()}")
-
-    remaining = scrape_vinted.get_ebay_browse_remaining()
-    print(f"[Both] eBay buy.browse remaining: {remaining}")
-
-    if remaining <= 0:
-        print("[Both] No remaining — skipping run (not updating last update time)")
-        return
-
-    # 1) Vinted
-    scrape_vinted.save_vinted_last_update(start)
+def _run_vinted():
     print("[Both] --- Vinted ---")
     try:
         scrape_vinted.scrape_once()
@@ -45,9 +41,8 @@ def run_cycle():
     except Exception as exc:
         print(f"[Both] Vinted error: {exc}")
 
-    # 2) Catawiki (start time for dashboard)
-    catawiki_start = datetime.now(timezone.utc)
-    scrape_catawiki.save_catawiki_last_update(catawiki_start)
+
+def _run_catawiki():
     print("[Both] --- Catawiki ---")
     try:
         scrape_catawiki.scrape_category(scrape_catawiki.CATEGORY_URL)
@@ -56,8 +51,27 @@ def run_cycle():
         print(f"[Both] Catawiki error: {exc}")
 
 
+def run_cycle():
+    start = datetime.now(timezone.utc)
+    print(f"[Both] Starting cycle at {start.isoformat()}")
+
+    remaining = scrape_vinted.get_ebay_browse_remaining()
+    print(f"[Both] eBay buy.browse remaining: {remaining}")
+
+    if remaining <= 0:
+        print("[Both] No remaining — skipping run (not updating last update time)")
+        return
+
+    scrape_vinted.save_vinted_last_update(start)
+    scrape_catawiki.save_catawiki_last_update(start)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_run_vinted), executor.submit(_run_catawiki)]
+        wait(futures, return_when=ALL_COMPLETED)
+
+
 def main():
-    print("[Both] Combined scraper: Vinted -> Catawiki -> sleep 3h (one machine)")
+    print("[Both] Combined scraper: Vinted + Catawiki in parallel -> sleep 3h (one machine)")
     while True:
         run_cycle()
         print(f"[Both] Sleeping for 3 hours ({SLEEP_SECONDS} seconds)...")
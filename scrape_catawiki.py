@@ -1,56 +1,34 @@
+import asyncio
+import contextlib
 import csv
+import hashlib
+import json
 import time
 import os
+import queue
 import re
-import sys
-import shutil
+import threading
 import base64
 from datetime import datetime, timezone
 from urllib.parse import urljoin, quote
 
+import aiohttp
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from pymongo import MongoClient
+from curl_cffi import requests as cfr
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+from selectolax.lexbor import LexborHTMLParser
+from bson import Binary
+from pymongo import MongoClient, UpdateOne
 
-
-def _load_env_from_dotenv() -> None:
-    """
-    Load environment variables from the Node server .env file so that
-    this Python script uses the same config (Mongo URI, eBay keys, etc.).
-    Existing environment variables are NOT overridden.
-    """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    candidate_paths = [
-        os.path.join(base_dir, "server", ".env"),
-        os.path.join(base_dir, ".env"),
-    ]
-
-    for path in candidate_paths:
-        if not os.path.exists(path):
-            continue
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    # Don't override anything already present in the real env
-                    if key and key not in os.environ:
-                        os.environ[key] = value
-        except Exception as e:
-            print(f"Warning: could not load env file {path}: {e}")
-        # Stop at the first .env we successfully read
-        break
+from ebay_limits import ebay_slot_async, parse_browse_remaining
+from ebay_token_cache import get_cached_token, invalidate_token, store_token
+from env_loader import load_env_from_dotenv
 
 
-_load_env_from_dotenv()
+load_env_from_dotenv()
 
 
 BASE_URL = "https://www.catawiki.com"
@@ -76,9 +54,47 @@ BROWSE_PARAMS = {"api_name": "browse", "api_context": "buy"}
 MONGO_METADATA_COLLECTION = os.getenv("MONGO_METADATA_COLLECTION", "scraper_metadata")
 # Page load timeout (seconds). On failure we retry once.
 CATAWIKI_PAGE_LOAD_TIMEOUT = int(os.getenv("CATAWIKI_PAGE_LOAD_TIMEOUT", "180"))
-
-_ebay_token = None
-_ebay_token_expiry = 0.0
+# Search pages are fetched over plain HTTP, this many at a time. curl_cffi
+# impersonates Chrome's TLS fingerprint, which is what Catawiki's anti-bot
+# checks, so no real browser is needed.
+CATAWIKI_FETCH_CONCURRENCY = 8
+CATAWIKI_IMPERSONATE = "chrome124"
+CATAWIKI_HEADERS = {"Accept-Language": "es-ES,es;q=0.9,en;q=0.8"}
+
+# One keep-alive session for all eBay calls, so TCP+TLS connections are reused.
+# Transient errors and 429s are retried with backoff; the final response is
+# still returned (not raised) so callers can report its status.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# A 4-digit year 1950–2049 in a lot title, and the numeric lot id in its URL
+_YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+_LOT_ID_RE = re.compile(r"/es/l/(\d+)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Stop a run once the Browse quota drops to this many calls; re-check the
+# quota with eBay every EBAY_QUOTA_PROBE_EVERY calls (or after a 429).
+EBAY_QUOTA_BUFFER = 10
+EBAY_QUOTA_PROBE_EVERY = 50
+
+# Fields whose change means a stored lot must be rewritten (see _content_hash)
+_HASHED_FIELDS = ("title", "price", "likes", "ebay_from", "ebay_to", "ebay_count")
+
+# eBay results by normalised query; many lots share (nearly) the same title
+_ebay_cache = TTLCache(maxsize=2048, ttl=3600)
+_ebay_cache_lock = threading.Lock()
 
 MARKETPLACE_DOMAIN = {
     "EBAY_US": "ebay.com",
@@ -92,47 +108,6 @@ MARKETPLACE_DOMAIN = {
 }
 
 
-def create_driver() -> webdriver.Chrome:
-    """
-    Create a real Chrome browser using Selenium.
-    This makes our scraper behave much closer to a real user.
-    """
-    chrome_options = Options()
-
-    # On headless Linux servers (Ubuntu VPS), Chrome often needs extra flags
-    # to start correctly (otherwise you see DevToolsActivePort / crashed errors).
-    if sys.platform.startswith("linux"):
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1280,800")
-
-        # Prefer a real Google Chrome binary if available
-        for path in ("/usr/bin/google-chrome", "/usr/bin/google-chrome-stable"):
-            if shutil.which(path):
-                chrome_options.binary_location = path
-                break
-    else:
-        # On desktop (Windows/macOS) you can see the window by commenting out
-        # the next line if you want to debug visually.
-        # chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--start-maximized")
-
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0 Safari/537.36"
-    )
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=chrome_options,
-    )
-    driver.set_page_load_timeout(CATAWIKI_PAGE_LOAD_TIMEOUT)
-    return driver
-
-
 def get_ebay_domain() -> str:
     return MARKETPLACE_DOMAIN.get(EBAY_MARKETPLACE_ID, "ebay.com")
 
@@ -142,19 +117,21 @@ def get_ebay_access_token() -> str:
     Get (and cache) an OAuth2 application access token from eBay,
     same as server/services/ebayService.js::getAccessToken.
     """
-    global _ebay_token, _ebay_token_expiry
     if not EBAY_CLIENT_ID or not EBAY_CLIENT_SECRET:
         raise RuntimeError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
 
+    # Reuse a token from this process, a previous run or another script
+    token = get_cached_token()
+    if token:
+        return token
+
     now = time.time()
-    if _ebay_token and now < _ebay_token_expiry:
-        return _ebay_token
 
     # HTTP Basic auth for eBay OAuth token endpoint (Base64, not hex)
     basic = f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode("utf-8")
     auth_header = "Basic " + base64.b64encode(basic).decode("ascii")
 
-    resp = requests.post(
+    resp = _SESSION.post(
         EBAY_TOKEN_URL,
         headers={
             "Content-Type": "application/x-www-form-urlencoded",
@@ -169,11 +146,10 @@ def get_ebay_access_token() -> str:
     if not resp.ok:
         raise RuntimeError(f"eBay token failed: {resp.status_code} {resp.text}")
 
-    data = resp.json()
-    _ebay_token = data.get("access_token")
-    expires_in = data.get("expires_in", 7200)
-    _ebay_token_expiry = now + float(expires_in) - 60.0
-    return _ebay_token
+    data = orjson.loads(resp.content)
+    token = data.get("access_token")
+    store_token(token, data.get("expires_in", 7200), now)
+    return token
 
 
 def format_ebay_price(value: float, currency: str | None) -> str | None:
@@ -187,41 +163,31 @@ def format_ebay_price(value: float, currency: str | None) -> str | None:
     return f"{value} {c}"
 
 
-def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
-    """
-    Mirror of server/services/ebayService.js::searchCurrentListings.
-    Returns dict with listings, total, minPrice, maxPrice, currency.
-    """
-    if not query or not query.strip():
-        return {
-            "listings": [],
-            "total": 0,
-            "minPrice": None,
-            "maxPrice": None,
-            "currency": None,
-        }
-
-    time.sleep(1)  # throttle to avoid eBay "too many requests"
-    token = get_ebay_access_token()
-    params = {
+class EbayRateLimitError(RuntimeError):
+    """eBay kept answering 429 Too Many Requests."""
+
+
+def _empty_ebay_result() -> dict:
+    return {
+        "listings": [],
+        "total": 0,
+        "minPrice": None,
+        "maxPrice": None,
+        "currency": None,
+    }
+
+
+def _browse_search_params(query: str, limit: int) -> dict:
+    # Only the matching item summaries; no refinement/aspect blocks in the body
+    return {
         "q": query.strip()[:350],
         "limit": str(max(1, min(int(limit), 50))),
+        "fieldgroups": "MATCHING_ITEMS",
     }
-    resp = requests.get(
-        EBAY_BROWSE_SEARCH_URL,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "X-EBAY-C-MARKETPLACE-ID": EBAY_MARKETPLACE_ID,
-        },
-        params=params,
-        timeout=30,
-    )
-    if not resp.ok:
-        raise RuntimeError(
-            f"eBay search failed: {resp.status_code} {resp.text[:200]}"
-        )
 
-    data = resp.json()
+
+def _parse_ebay_search_response(data: dict) -> dict:
+    """Turn a Browse item_summary/search JSON body into our eBay result dict."""
     item_summaries = data.get("itemSummaries", []) or []
     listings = []
     prices = []
@@ -254,13 +220,7 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
         )
 
     if not prices:
-        return {
-            "listings": [],
-            "total": 0,
-            "minPrice": None,
-            "maxPrice": None,
-            "currency": None,
-        }
+        return _empty_ebay_result()
 
     min_val = min(prices)
     max_val = max(prices)
@@ -274,6 +234,122 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
     }
 
 
+def _ebay_cache_key(query: str, limit: int) -> tuple[str, int]:
+    return (_WHITESPACE_RE.sub(" ", query.strip()[:200].lower()), int(limit))
+
+
+def _ebay_cache_get(key: tuple[str, int]) -> dict | None:
+    with _ebay_cache_lock:
+        return _ebay_cache.get(key)
+
+
+def _ebay_cache_put(key: tuple[str, int], result: dict) -> None:
+    with _ebay_cache_lock:
+        _ebay_cache[key] = result
+
+
+def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
+    """
+    Mirror of server/services/ebayService.js::searchCurrentListings.
+    Returns dict with listings, total, minPrice, maxPrice, currency.
+    Synchronous single lookup through _batch_ebay (so it shares its cache and
+    limits); scrape_category batches whole pages instead.
+    """
+    async def _one() -> object:
+        async with _ebay_client_session() as session:
+            (result,), _sent = await _batch_ebay(session, [query], limit=limit)
+        return result
+
+    result = asyncio.run(_one())
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def _ebay_client_session() -> aiohttp.ClientSession:
+    """Keep-alive aiohttp session for Browse searches; the token is sent per request."""
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={"X-EBAY-C-MARKETPLACE-ID": EBAY_MARKETPLACE_ID},
+    )
+
+
+async def _ebay_search_async(
+    session: aiohttp.ClientSession,
+    title: str,
+    token: str,
+    sem: asyncio.Semaphore,
+    limit: int = 5,
+) -> dict:
+    """Search eBay for one title on the shared session."""
+    if not title or not title.strip():
+        return _empty_ebay_result()
+
+    async with sem, ebay_slot_async():
+        for attempt in range(4):
+            async with session.get(
+                EBAY_BROWSE_SEARCH_URL,
+                headers={"Authorization": f"Bearer {token}"},
+                params=_browse_search_params(title, limit),
+            ) as resp:
+                if resp.status == 429:
+                    # Back off exponentially, then give up on this title
+                    if attempt < 3:
+                        await asyncio.sleep(min(60, 2 ** attempt))
+                        continue
+                    raise EbayRateLimitError("eBay search failed: 429 Too Many Requests")
+                if resp.status == 401:
+                    invalidate_token()
+                if resp.status >= 400:
+                    text = await resp.text()
+                    raise RuntimeError(f"eBay search failed: {resp.status} {text[:200]}")
+                data = orjson.loads(await resp.read())
+                break
+
+    return _parse_ebay_search_response(data)
+
+
+async def _batch_ebay(
+    session: aiohttp.ClientSession,
+    titles: list[str],
+    concurrency: int = 8,
+    rps: float = 5.0,
+    limit: int = 5,
+) -> tuple[list, int]:
+    """
+    Search eBay for many titles at once on `session` (see _ebay_client_session).
+    At most `concurrency` requests are in flight, and new requests are started
+    no faster than `rps` per second to stay under the Browse quota.
+    Cached and repeated titles are not sent again.
+    Returns (results, sent): one result dict per title, in order, or the
+    Exception it raised; and how many Browse calls were actually made.
+    """
+    # The token call is blocking HTTP; keep it off the event loop
+    token = await asyncio.to_thread(get_ebay_access_token)
+    sem = asyncio.Semaphore(concurrency)
+
+    keys = [_ebay_cache_key(title, limit) for title in titles]
+    results: dict[tuple[str, int], object] = {}
+    tasks = {}
+
+    for title, key in zip(titles, keys):
+        if key in results or key in tasks:
+            continue
+        cached = _ebay_cache_get(key)
+        if cached is not None:
+            results[key] = cached
+            continue
+        tasks[key] = asyncio.create_task(_ebay_search_async(session, title, token, sem, limit))
+        await asyncio.sleep(1.0 / rps)
+    fetched = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    for key, result in zip(tasks, fetched):
+        results[key] = result
+        if not isinstance(result, BaseException):
+            _ebay_cache_put(key, result)
+    return [results[key] for key in keys], len(tasks)
+
+
 def build_ebay_link(title: str) -> str | None:
     if not title:
         return None
@@ -283,34 +359,105 @@ def build_ebay_link(title: str) -> str | None:
     return f"https://www.{domain}/sch/i.html?_nkw={query}"
 
 
-def get_ebay_browse_remaining() -> int:
+def probe_ebay_browse_remaining() -> int | None:
     """
     Check application rate limit for buy.browse (same as check_ebay_usage).
-    Returns remaining calls; 0 if none or on error (so bot skips run).
+    Returns remaining calls, or None if the check itself failed.
     """
     try:
         token = get_ebay_access_token()
-        resp = requests.get(
+        resp = _SESSION.get(
             EBAY_RATE_LIMIT_URL,
             headers={"Authorization": f"Bearer {token}"},
             params=BROWSE_PARAMS,
             timeout=30,
         )
         if resp.status_code == 204 or not resp.ok:
-            return 0
-        data = resp.json()
-        rate_limits = data.get("rateLimits") or []
-        remaining = None
-        for api in rate_limits:
-            for res in api.get("resources") or []:
-                for rate in res.get("rates") or []:
-                    r = rate.get("remaining")
-                    if r is not None:
-                        remaining = min(remaining, r) if remaining is not None else r
-        return int(remaining) if remaining is not None else 0
+            print(f"[Catawiki bot] Rate limit check failed: HTTP {resp.status_code}")
+            return None
+        return parse_browse_remaining(orjson.loads(resp.content))
     except Exception as e:
         print(f"[Catawiki bot] Rate limit check failed: {e}")
-        return 0
+        return None
+
+
+def get_ebay_browse_remaining() -> int:
+    """Remaining buy.browse calls; 0 if none or on error (so bot skips run)."""
+    remaining = probe_ebay_browse_remaining()
+    return remaining if remaining is not None else 0
+
+
+def _content_hash(doc: dict) -> bytes:
+    """Stable 16-byte BLAKE2b digest of the _HASHED_FIELDS of a lot document."""
+    canonical = json.dumps(
+        [doc.get(field) for field in _HASHED_FIELDS],
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+class BulkWriter:
+    """
+    Background thread that upserts queued UpdateOne ops into a collection
+    with bulk_write, in batches of `batch_size` or every `flush_interval`
+    seconds, whichever comes first. Keeps Mongo round-trips off the scrape
+    loop; close() flushes what is left and waits for the thread.
+    """
+
+    def __init__(self, col, batch_size: int = 200, flush_interval: float = 2.0, maxsize: int = 1000):
+        self.col = col
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="catawiki-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, op: UpdateOne) -> None:
+        self._queue.put(op)
+
+    async def put_async(self, op: UpdateOne) -> None:
+        """put() for coroutines: if the queue is full, wait in a thread, not on the event loop."""
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, op)
+
+    def close(self) -> None:
+        self._queue.put(None)  # sentinel: flush and stop
+        self._thread.join()
+
+    def _flush(self, ops: list) -> None:
+        try:
+            self.col.bulk_write(ops, ordered=False)
+            self.written += len(ops)
+        except Exception as e:
+            print(f"[Catawiki bot] bulk_write of {len(ops)} ops failed: {e}")
+
+    def _run(self) -> None:
+        ops = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            done = False
+            try:
+                op = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if op is None:
+                    done = True
+                else:
+                    ops.append(op)
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if ops and (done or len(ops) >= self.batch_size or now >= deadline):
+                self._flush(ops)
+                ops = []
+            if now >= deadline:
+                deadline = now + self.flush_interval
+            if done:
+                return
 
 
 def save_catawiki_last_update(now) -> None:
@@ -329,28 +476,59 @@ def save_catawiki_last_update(now) -> None:
         print(f"[Catawiki bot] Failed to save catawikiLastUpdate: {e}")
 
 
-def fetch_page_html(driver: webdriver.Chrome, url: str) -> BeautifulSoup:
+def _is_timeout(e: Exception) -> bool:
+    return "timed out" in str(e).lower() or "timeout" in str(e).lower()
+
+
+async def _fetch_page_async(
+    session: cfr.AsyncSession, sem: asyncio.Semaphore, url: str
+) -> str | None:
+    """Fetch one search page; returns None if it failed (retries once on timeout)."""
+    async with sem:
+        for attempt in range(2):
+            try:
+                resp = await session.get(url)
+                resp.raise_for_status()
+                return resp.text
+            except Exception as e:
+                if attempt == 0 and _is_timeout(e):
+                    print(f"[Catawiki bot] Timeout on {url}, retrying in 5s...")
+                    await asyncio.sleep(5)
+                    continue
+                print(f"[Catawiki bot] Failed to fetch {url}: {e}")
+                break
+        return None
+
+
+async def iter_pages(urls: list[str]):
     """
-    Use Selenium to open the page like a real browser and return a BeautifulSoup object.
-    Retries once on timeout (page load or read timeout).
+    Yield (url, html) for each search page, in order, as soon as it arrives.
+    All pages download in the background (CATAWIKI_FETCH_CONCURRENCY at a
+    time, Chrome-impersonating, no browser), so later pages are fetched while
+    the caller is still busy with earlier ones. html is None for failed pages.
+    Pages not yet consumed are cancelled when the generator is closed.
     """
-    for attempt in range(2):
+    sem = asyncio.Semaphore(CATAWIKI_FETCH_CONCURRENCY)
+
+    async with cfr.AsyncSession(
+        impersonate=CATAWIKI_IMPERSONATE,
+        headers=CATAWIKI_HEADERS,
+        timeout=CATAWIKI_PAGE_LOAD_TIMEOUT,
+        max_clients=CATAWIKI_FETCH_CONCURRENCY,
+    ) as session:
+        tasks = [
+            asyncio.create_task(_fetch_page_async(session, sem, url)) for url in urls
+        ]
         try:
-            driver.get(url)
-            break
-        except Exception as e:
-            if attempt == 0 and ("timed out" in str(e).lower() or "timeout" in str(e).lower()):
-                print(f"[Catawiki bot] Timeout on page load, retrying in 5s...")
-                time.sleep(5)
-                continue
-            raise
-    # Wait a bit for dynamic content to load
-    time.sleep(3)
-    html = driver.page_source
-    return BeautifulSoup(html, "html.parser")
+            for url, task in zip(urls, tasks):
+                yield url, await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 
-def parse_listings(soup: BeautifulSoup):
+def parse_listings(html: str):
     """
     Extract sports card listings and the URL of the next page.
 
@@ -358,13 +536,14 @@ def parse_listings(soup: BeautifulSoup):
     If you get 0 results, open the category page in your browser,
     inspect one card, and adjust the CSS selectors below.
     """
+    tree = LexborHTMLParser(html)
     items = []
 
     # Each search result lot is an <a> linking to /es/l/....
     # We use the anchor text itself to extract title, price and likes (heart count),
     # and try to grab a thumbnail image URL as photo_url.
-    for card in soup.select("a[href*='/es/l/']"):
-        href = card.get("href")
+    for card in tree.css("a[href*='/es/l/']"):
+        href = card.attributes.get("href")
         if not href:
             continue
 
@@ -373,7 +552,7 @@ def parse_listings(soup: BeautifulSoup):
         # Get all non-empty text lines inside the card
         text_lines = [
             line.strip()
-            for line in card.get_text("\n", strip=True).split("\n")
+            for line in card.text(separator="\n", strip=True).split("\n")
             if line.strip()
         ]
         if not text_lines:
@@ -398,8 +577,8 @@ def parse_listings(soup: BeautifulSoup):
         container = card.parent
         if container is not None:
             # Look for small numbers that could be the favourite count
-            for span in container.select("span"):
-                txt = span.get_text(strip=True)
+            for span in container.css("span"):
+                txt = span.text(strip=True)
                 if txt.isdigit():
                     likes = int(txt)
                     break
@@ -407,12 +586,13 @@ def parse_listings(soup: BeautifulSoup):
         # Try to extract a thumbnail image URL
         photo_url = ""
         # First, check for an <img> inside the anchor itself
-        img = card.select_one("img")
+        img = card.css_first("img")
         if img is None and container is not None:
             # Fallback: look for an <img> in the parent container
-            img = container.select_one("img")
+            img = container.css_first("img")
         if img is not None:
-            src = img.get("src") or img.get("data-src") or img.get("srcset", "").split(" ")[0]
+            attrs = img.attributes
+            src = attrs.get("src") or attrs.get("data-src") or (attrs.get("srcset") or "").split(" ")[0]
             if src:
                 if src.startswith("http"):
                     photo_url = src
@@ -433,41 +613,44 @@ def parse_listings(soup: BeautifulSoup):
 
     # Find "next page" link (not used in current workflow but kept for reference)
     next_url = None
-    next_link = soup.select_one(
+    next_link = tree.css_first(
         "a[rel='next'], "
         "a[aria-label='Next'], "
         "a[aria-label='Siguiente']"
     )
-    if next_link and next_link.get("href"):
-        next_url = urljoin(BASE_URL, next_link["href"])
+    if next_link and next_link.attributes.get("href"):
+        next_url = urljoin(BASE_URL, next_link.attributes["href"])
 
     return items, next_url
 
 
-def scrape_category(start_url: str):
-    """Scrape up to 30 pages of the category and save results into MongoDB."""
-    max_pages = 50
-
-    # Normalise base URL so we can force ?page=1..30 ourselves
-    if "&page=" in start_url:
-        base_url = start_url.split("&page=", 1)[0]
-    else:
-        base_url = start_url
-
-    # Open Mongo once for the whole run
-    client = MongoClient(MONGODB_URI)
-    db = client[MONGO_DB_NAME]
-    col = db[MONGO_COLLECTION]
-
-    upserted = 0
-
-    driver = create_driver()
-    try:
-        for page_num in range(1, max_pages + 1):
-            url = f"{base_url}&page={page_num}"
+async def _scrape_pages(urls: list[str], col, writer: BulkWriter) -> None:
+    """
+    Parse each page as it arrives, look its lots up on eBay and queue the
+    upserts on `writer`. Page downloads, eBay lookups and Mongo writes overlap;
+    the one Mongo read per page runs in a worker thread.
+    """
+    # Track the Browse quota locally so we stop before it runs out. The caller
+    # checked it before starting, so the first real reading comes after
+    # EBAY_QUOTA_PROBE_EVERY calls; until then there is no estimate (None).
+    remaining: int | None = None
+    calls_since_probe = 0
+
+    # Lots already handled this run; pagination can repeat a lot on later pages
+    seen_ids: set[int] = set()
+
+    # One keep-alive session for every Browse search of the run
+    async with _ebay_client_session() as ebay_session, contextlib.aclosing(
+        iter_pages(urls)
+    ) as pages:
+        page_num = 0
+        async for url, html in pages:
+            page_num += 1
             print(f"Scraping page {page_num}: {url}")
-            soup = fetch_page_html(driver, url)
-            items, _next_url = parse_listings(soup)
+            if html is None:
+                print("  Could not fetch this page; skipping.")
+                continue
+            items, _next_url = parse_listings(html)
             print(f"  Found {len(items)} raw items on this page")
 
             # Filter by min likes 10, like Vinted
@@ -477,25 +660,67 @@ def scrape_category(start_url: str):
                 print("  No items with enough likes on this page; stopping early.")
                 break
 
-            # For each liked item on THIS page, fetch eBay and save to DB
+            # Keep items with a year in the title and a lot id, then look all
+            # of them up on eBay in one concurrent batch
+            candidates = []
             for row in liked_items:
-                title = row.get("title", "") or ""
-                # Like the Vinted scraper, skip items that don't have a year in the title.
-                # Look for a 4-digit year starting with 19xx or 20xx.
-                if not re.search(r"\b(19[5-9]\d|20[0-4]\d)\b", title):
-                    continue
-
                 lot_url = row.get("url", "")
-                m = re.search(r"/es/l/(\d+)", lot_url)
+                m = _LOT_ID_RE.search(lot_url)
                 if not m:
                     continue
+
                 lot_id = int(m.group(1))
+                if lot_id in seen_ids:
+                    continue
 
-                # Fetch eBay current listings; skip cards with no eBay matches
+                # Like the Vinted scraper, skip items that don't have a year in the title.
+                if not _YEAR_RE.search(row.get("title", "") or ""):
+                    continue
+                seen_ids.add(lot_id)
+                candidates.append((row, lot_url, lot_id))
+
+            titles = [row.get("title", "")[:200] for row, _url, _id in candidates]
+            results = []
+            if titles:
+                if calls_since_probe >= EBAY_QUOTA_PROBE_EVERY:
+                    probed = await asyncio.to_thread(probe_ebay_browse_remaining)
+                    calls_since_probe = 0
+                    if probed is not None:
+                        remaining = probed
+                    else:
+                        # A failed check says nothing about the quota; keep going
+                        # on the local estimate and try again later
+                        print("  Could not re-check the eBay quota; using the local estimate.")
+                if remaining is not None and remaining <= EBAY_QUOTA_BUFFER:
+                    print(f"  eBay buy.browse remaining is {remaining}; stopping early.")
+                    break
                 try:
-                    ebay = search_ebay_current_listings(row.get("title", "")[:200], limit=5)
+                    results, sent = await _batch_ebay(ebay_session, titles, concurrency=8, rps=5)
                 except Exception as e:
-                    print(f"    eBay error for '{row.get('title', '')}': {e}")
+                    print(f"    eBay batch error: {e}")
+                else:
+                    if remaining is not None:
+                        remaining -= sent
+                    calls_since_probe += sent
+                    if any(isinstance(r, EbayRateLimitError) for r in results):
+                        # Re-check the real quota before the next page
+                        calls_since_probe = EBAY_QUOTA_PROBE_EVERY
+
+            # Hashes of the lots we already have, to skip rewriting unchanged ones
+            stored_hashes = {}
+            if results:
+                lot_ids = [lot_id for _row, _url, lot_id in candidates]
+                stored_docs = await asyncio.to_thread(
+                    lambda: list(col.find({"id": {"$in": lot_ids}}, {"id": 1, "content_hash": 1}))
+                )
+                for stored in stored_docs:
+                    stored_hashes[stored["id"]] = stored.get("content_hash")
+
+            unchanged = 0
+            for (row, lot_url, lot_id), ebay in zip(candidates, results):
+                # Skip cards whose eBay lookup failed or found no matches
+                if isinstance(ebay, BaseException):
+                    print(f"    eBay error for '{row.get('title', '')}': {ebay}")
                     continue
                 if not ebay.get("listings"):
                     continue
@@ -519,29 +744,59 @@ def scrape_category(start_url: str):
                     "ebay_link": build_ebay_link(row.get("title", "")),
                     "updatedAt": now,
                 }
+                content_hash = _content_hash(doc)
+                stored_hash = stored_hashes.get(lot_id)
+                if stored_hash is not None and bytes(stored_hash) == content_hash:
+                    unchanged += 1
+                    continue
+                doc["content_hash"] = Binary(content_hash)
 
                 # Ensure createdAt is set only on first insert; updatedAt always updated
-                col.update_one(
-                    {"id": lot_id},
-                    {
-                        "$set": doc,
-                        "$setOnInsert": {"createdAt": now},
-                    },
-                    upsert=True,
+                await writer.put_async(
+                    UpdateOne(
+                        {"id": lot_id},
+                        {
+                            "$set": doc,
+                            "$setOnInsert": {"createdAt": now},
+                        },
+                        upsert=True,
+                    )
                 )
-                upserted += 1
 
-            time.sleep(2)  # be polite between pages
+            if unchanged:
+                print(f"  Skipped {unchanged} unchanged lots")
+
+
+def scrape_category(start_url: str):
+    """Scrape up to 30 pages of the category and save results into MongoDB."""
+    max_pages = 50
+
+    # Normalise base URL so we can force ?page=1..30 ourselves
+    if "&page=" in start_url:
+        base_url = start_url.split("&page=", 1)[0]
+    else:
+        base_url = start_url
+
+    # Open Mongo once for the whole run
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGO_DB_NAME]
+    col = db[MONGO_COLLECTION]
+    # Same unique index as the Mongoose Item model; makes upsert lookups by id cheap
+    try:
+        col.create_index("id", unique=True)
+    except Exception as e:
+        print(f"[Catawiki bot] Could not ensure index on id: {e}")
+
+    urls = [f"{base_url}&page={page_num}" for page_num in range(1, max_pages + 1)]
+
+    print(f"Fetching {len(urls)} pages ({CATAWIKI_FETCH_CONCURRENCY} at a time)...")
+    writer = BulkWriter(col)
+    try:
+        asyncio.run(_scrape_pages(urls, col, writer))
     finally:
-        # Some environments can throw RemoteDisconnected when shutting down
-        # the ChromeDriver service. We ignore shutdown errors because the
-        # scraping work is already done at this point.
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        writer.close()
 
-    print(f"Upserted {upserted} Catawiki lots into MongoDB (with eBay data)")
+    print(f"Upserted {writer.written} Catawiki lots into MongoDB (with eBay data)")
 
 
 def run_forever():
@@ -1,53 +1,48 @@
+import atexit
+import functools
+import math
+import multiprocessing
+import multiprocessing.pool
+import multiprocessing.util
 import os
 import sys
+import threading
 import time
 import re
 import base64
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from urllib.parse import urlencode, urljoin, quote
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from pymongo import MongoClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from pymongo import MongoClient, UpdateOne
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+  SessionNotCreatedException,
+  TimeoutException,
+  WebDriverException,
+)
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
 import shutil
 
+from ebay_limits import EBAY_SEMAPHORE, parse_browse_remaining, wait_for_ebay_slot
+from ebay_token_cache import get_cached_token, invalidate_token, store_token
+from env_loader import load_env_from_dotenv
 
-def _load_env_from_dotenv() -> None:
-  """
-  Load environment variables from the same .env files that the Node
-  server uses, so this Python script shares configuration (Mongo URI,
-  eBay keys, Vinted domain/search, etc.).
-  """
-  base_dir = os.path.dirname(os.path.abspath(__file__))
-  candidate_paths = [
-    os.path.join(base_dir, "server", ".env"),
-    os.path.join(base_dir, ".env"),
-  ]
-
-  for path in candidate_paths:
-    if not os.path.exists(path):
-      continue
-    try:
-      with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-          line = line.strip()
-          if not line or line.startswith("#") or "=" not in line:
-            continue
-          key, value = line.split("=", 1)
-          key = key.strip()
-          value = value.strip()
-          if key and key not in os.environ:
-            os.environ[key] = value
-    except Exception as e:
-      print(f"Warning: could not load env file {path}: {e}")
-    break
 
-
-_load_env_from_dotenv()
+load_env_from_dotenv()
 
 
 # --- Shared config (Mongo + Vinted + eBay) -----------------------------------
@@ -55,6 +50,11 @@ _load_env_from_dotenv()
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/vinted")
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "vinted")
 MONGO_COLLECTION = os.getenv("MONGO_COLLECTION", "items")
+# eBay results per normalized title, shared between runs; Mongo expires them
+EBAY_CACHE_COLLECTION = os.getenv("EBAY_CACHE_COLLECTION", "ebay_cache")
+EBAY_CACHE_TTL = 24 * 60 * 60
+# Items saved more recently than this are not looked up on eBay again
+VINTED_REFRESH_HOURS = float(os.getenv("VINTED_REFRESH_HOURS", "24"))
 
 VINTED_DOMAIN = (os.getenv("VINTED_DOMAIN", "es") or "es").lower()
 VINTED_SEARCH = os.getenv("VINTED_SEARCH", "sport card")
@@ -62,9 +62,26 @@ VINTED_MIN_LIKES = int(os.getenv("VINTED_MIN_LIKES", "10"))
 VINTED_MAX_PAGES = int(os.getenv("VINTED_MAX_PAGES", "30"))
 # Page load timeout (seconds). On failure we retry once.
 VINTED_PAGE_LOAD_TIMEOUT = int(os.getenv("VINTED_PAGE_LOAD_TIMEOUT", "180"))
+# Max seconds to wait for the first catalog card to render after a page load
+VINTED_CARDS_WAIT = 10
+# Requests Chrome drops (CDP Network.setBlockedURLs patterns)
+BLOCKED_URL_PATTERNS = [
+  "*google-analytics*",
+  "*googletagmanager*",
+  "*doubleclick*",
+  "*facebook.net*",
+  "*hotjar*",
+  "*.woff2",
+]
+# Catalog pages come from Vinted's JSON API; the browser is only used when the
+# API refuses us (or always, with VINTED_USE_BROWSER=1)
+VINTED_USE_BROWSER = os.getenv("VINTED_USE_BROWSER", "").strip().lower() in ("1", "true", "yes")
+# Browser worker processes (one Chrome each) loading catalog pages in parallel
+VINTED_BROWSER_WORKERS = max(1, int(os.getenv("VINTED_BROWSER_WORKERS", "4")))
 
 BASE_URL = f"https://www.vinted.{VINTED_DOMAIN}"
 CATALOG_URL = f"{BASE_URL}/catalog"
+CATALOG_API_URL = f"{BASE_URL}/api/v2/catalog/items"
 
 EBAY_CLIENT_ID = os.getenv("EBAY_CLIENT_ID")
 EBAY_CLIENT_SECRET = os.getenv("EBAY_CLIENT_SECRET")
@@ -78,15 +95,153 @@ BROWSE_PARAMS = {"api_name": "browse", "api_context": "buy"}
 
 MONGO_METADATA_COLLECTION = os.getenv("MONGO_METADATA_COLLECTION", "scraper_metadata")
 
-_ebay_token = None
-_ebay_token_expiry = 0.0
+# Plain HTTP session for Vinted itself (kept apart from the eBay session so
+# the eBay bearer token is never sent to Vinted)
+_vinted_http = requests.Session()
+_vinted_http.headers.update(
+  {
+    "User-Agent": (
+      "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+      "AppleWebKit/537.36 (KHTML, like Gecko) "
+      "Chrome/122.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+  }
+)
+
+# Parallel eBay lookups per catalog page
+EBAY_WORKERS = 8
+
+# Keep-alive session for all eBay calls, pooled for the EBAY_WORKERS threads.
+# The bearer token is sent per request; the session's headers are never mutated.
+_http = requests.Session()
+_http.mount(
+  "https://",
+  HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+      total=3,
+      backoff_factor=0.5,
+      status_forcelist=[429, 502, 503, 504],
+      raise_on_status=False,
+    ),
+  ),
+)
+
+# Only one EBAY_WORKERS thread refreshes an expired token; the rest wait for it
+_ebay_token_lock = threading.Lock()
+
+
+# One Mongo client for the process, reused across scrape cycles (see get_mongo_client)
+_mongo_client = None
+_mongo_client_lock = threading.Lock()
+
+# In a browser worker: its Chrome instance, reused across scrape cycles
+# (see get_driver). The main process never starts a browser itself.
+_driver = None
+
+# Pool of browser worker processes, kept across cycles (see _get_browser_pool)
+_browser_pool = None
+# In a worker: the scrape cycle its browser session (cookies) belongs to
+_worker_cycle = None
+
+# In-process copy of the eBay cache, keyed by _ebay_cache_key
+_ebay_cache = TTLCache(maxsize=4096, ttl=EBAY_CACHE_TTL)
+_ebay_cache_lock = threading.Lock()
+
+# Resolved chromedriver binary, remembered across runs (see _chromedriver_path)
+CHROMEDRIVER_PATH_FILE = os.path.join(
+  os.path.dirname(os.path.abspath(__file__)), ".chromedriver_path"
+)
+# Days a chromedriver downloaded by webdriver_manager is reused without a version check
+CHROMEDRIVER_CACHE_DAYS = 30
+# Set once a chromedriver on PATH turned out not to match the installed Chrome
+_skip_system_chromedriver = False
+# In a browser worker: the chromedriver the parent resolved for the pool
+_worker_chromedriver_path = None
+
+
+# Same year pattern as Node vintedScraper.js: 1970–2030
+_YEAR_RE = re.compile(r"\b(19[7-9]\d|20[0-2]\d|2030)\b")
+_PRODUCT_ID_RE = re.compile(r"product-item-id-(\d+)")
+_PRICE_EUR_RE = re.compile(r"\d+[.,]\d{2}\s*€")
+# Overlay title in one pass: "Title, marca: Brand, estado: Cond, 12,50 €, 13,83 € ..."
+_OVERLAY_RE = re.compile(
+  r"^(?P<title>(?:(?!, marca:).)+?)"  # never past the first ", marca:"
+  r"(?:,\s*marca:\s*(?P<brand>[^,]+))?"
+  r"(?:,\s*estado:\s*(?P<cond>[^,]+))?"
+  r",\s*(?P<base>\d+[.,]\d{2})\s*€.*?(?P<incl>\d+[.,]\d{2})\s*€"
+)
+_ITEMS_URL_RE = re.compile(r"/items/(\d+)")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]")
+
+
+# Catalog card selectors (see parse_vinted_cards for the markup)
+_SEL_CARD = "div.new-item-box__container"
+_SEL_OVERLAY = "a.new-item-box__overlay"
+_SEL_BRAND = "p[data-testid$='--description-title']"
+_SEL_COND = "p[data-testid$='--description-subtitle']"
+_SEL_PRICE = "p[data-testid$='--price-text']"
+_SEL_LIKES = "span[data-testid='favourite-count-text']"
+_SEL_IMG = "img[data-testid$='--image--img']"
+# Same parts by exact data-testid, once the card's product id is known
+_SEL_BRAND_ID = "p[data-testid='product-item-id-{id}--description-title']"
+_SEL_COND_ID = "p[data-testid='product-item-id-{id}--description-subtitle']"
+_SEL_PRICE_ID = "p[data-testid='product-item-id-{id}--price-text']"
+_SEL_IMG_ID = "img[data-testid='product-item-id-{id}--image--img']"
+
+
+def _text(node: LexborNode | None) -> str:
+  return node.text().strip() if node is not None else ""
 
 
 def title_has_year(title: str) -> bool:
-  if not title or not isinstance(title, str):
-    return False
-  # Same pattern as Node vintedScraper.js: 1970–2030
-  return bool(re.search(r"\b(19[7-9]\d|20[0-2]\d|2030)\b", title))
+  return bool(title) and isinstance(title, str) and _YEAR_RE.search(title) is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+  """
+  Path of the chromedriver binary. A chromedriver on PATH is used as is.
+  Otherwise ChromeDriverManager's result is saved to CHROMEDRIVER_PATH_FILE
+  and reused while that binary still exists and is executable.
+  """
+  if not _skip_system_chromedriver:
+    path = shutil.which("chromedriver")
+    if path:
+      return path
+
+  try:
+    with open(CHROMEDRIVER_PATH_FILE, "r", encoding="utf-8") as f:
+      path = f.read().strip()
+    if path and os.access(path, os.X_OK):
+      return path
+  except OSError:
+    pass
+
+  # Trust a driver webdriver_manager already downloaded (in ~/.wdm) for
+  # CHROMEDRIVER_CACHE_DAYS instead of checking online for a newer one
+  cache = DriverCacheManager(valid_range=CHROMEDRIVER_CACHE_DAYS)
+  path = ChromeDriverManager(cache_manager=cache).install()
+  try:
+    with open(CHROMEDRIVER_PATH_FILE, "w", encoding="utf-8") as f:
+      f.write(path)
+  except OSError as e:
+    print(f"[VintedPy] Could not save chromedriver path: {e}")
+  return path
+
+
+def _forget_chromedriver_path() -> None:
+  global _skip_system_chromedriver
+  if not _skip_system_chromedriver and shutil.which("chromedriver"):
+    _skip_system_chromedriver = True
+  _chromedriver_path.cache_clear()
+  try:
+    os.remove(CHROMEDRIVER_PATH_FILE)
+  except OSError:
+    pass
 
 
 def create_driver() -> webdriver.Chrome:
@@ -117,48 +272,130 @@ def create_driver() -> webdriver.Chrome:
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/122.0 Safari/537.36"
   )
-
-  driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=chrome_options,
-  )
+  # We only read markup and image URLs, so skip downloading the pixels
+  chrome_options.add_experimental_option("prefs", {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+  })
+
+  if _worker_chromedriver_path:
+    # Pool worker: use the parent's driver path. On a version mismatch the
+    # error goes back to the parent, which resolves it again (scrape_once)
+    driver = webdriver.Chrome(
+      service=Service(_worker_chromedriver_path),
+      options=chrome_options,
+    )
+  else:
+    try:
+      driver = webdriver.Chrome(
+        service=Service(_chromedriver_path()),
+        options=chrome_options,
+      )
+    except SessionNotCreatedException:
+      # Cached driver no longer matches the installed Chrome; resolve it again
+      _forget_chromedriver_path()
+      driver = webdriver.Chrome(
+        service=Service(_chromedriver_path()),
+        options=chrome_options,
+      )
   # Fail page loads sooner than default 120s so we can retry
   driver.set_page_load_timeout(VINTED_PAGE_LOAD_TIMEOUT)
+  # Don't fetch trackers and web fonts; they only slow down page loads
+  try:
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    driver.execute_cdp_cmd("Network.enable", {})
+  except Exception as e:
+    print(f"[VintedPy] Could not set blocked URLs: {e}")
   return driver
 
 
+def get_driver() -> webdriver.Chrome:
+  """
+  Return this worker's Chrome driver, creating it on first use or if the
+  browser has died. It stays open between cycles and is quit when the
+  worker exits (see _init_browser_worker).
+  """
+  global _driver
+  if _driver is not None:
+    try:
+      _driver.current_url  # raises if the browser/session is gone
+      return _driver
+    except Exception:
+      close_driver()
+  _driver = create_driver()
+  return _driver
+
+
+def close_driver() -> None:
+  global _driver
+  if _driver is None:
+    return
+  try:
+    _driver.quit()
+  except Exception:
+    pass
+  _driver = None
+
+
+def get_mongo_client() -> MongoClient:
+  """Return the shared MongoClient (it pools connections itself), creating it on first use."""
+  global _mongo_client
+  with _mongo_client_lock:
+    if _mongo_client is None:
+      _mongo_client = MongoClient(MONGODB_URI)
+    return _mongo_client
+
+
+def close_mongo_client() -> None:
+  global _mongo_client
+  with _mongo_client_lock:
+    if _mongo_client is not None:
+      _mongo_client.close()
+      _mongo_client = None
+
+
+atexit.register(close_mongo_client)
+
+
 def get_ebay_access_token() -> str:
-  global _ebay_token, _ebay_token_expiry
   if not EBAY_CLIENT_ID or not EBAY_CLIENT_SECRET:
     raise RuntimeError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
 
-  now = time.time()
-  if _ebay_token and now < _ebay_token_expiry:
-    return _ebay_token
-
-  basic = f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode("utf-8")
-  auth_header = "Basic " + base64.b64encode(basic).decode("ascii")
-
-  resp = requests.post(
-    EBAY_TOKEN_URL,
-    headers={
-      "Content-Type": "application/x-www-form-urlencoded",
-      "Authorization": auth_header,
-    },
-    data={
-      "grant_type": "client_credentials",
-      "scope": EBAY_SCOPE,
-    },
-    timeout=30,
-  )
-  if not resp.ok:
-    raise RuntimeError(f"eBay token failed: {resp.status_code} {resp.text}")
+  # Reuse a token from this process, a previous run or the other scrapers
+  token = get_cached_token()
+  if token:
+    return token
+
+  with _ebay_token_lock:
+    # Another thread may have refreshed it while we waited for the lock
+    token = get_cached_token()
+    if token:
+      return token
+
+    now = time.time()
+
+    basic = f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode("utf-8")
+    auth_header = "Basic " + base64.b64encode(basic).decode("ascii")
+
+    resp = _http.post(
+      EBAY_TOKEN_URL,
+      headers={
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Authorization": auth_header,
+      },
+      data={
+        "grant_type": "client_credentials",
+        "scope": EBAY_SCOPE,
+      },
+      timeout=30,
+    )
+    if not resp.ok:
+      raise RuntimeError(f"eBay token failed: {resp.status_code} {resp.text}")
 
-  data = resp.json()
-  _ebay_token = data.get("access_token")
-  expires_in = data.get("expires_in", 7200)
-  _ebay_token_expiry = now + float(expires_in) - 60.0
-  return _ebay_token
+    data = orjson.loads(resp.content)
+    token = data.get("access_token")
+    store_token(token, data.get("expires_in", 7200), now)
+    return token
 
 
 def format_ebay_price(value, currency: str | None) -> str | None:
@@ -182,28 +419,34 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
       "currency": None,
     }
 
-  time.sleep(1)  # throttle to avoid eBay "too many requests"
   token = get_ebay_access_token()
   params = {
     "q": query.strip()[:350],
     "limit": str(max(1, min(int(limit), 50))),
+    # Only the item summaries; skips refinement/aspect data we never read
+    "fieldgroups": "MATCHING_ITEMS",
   }
-  resp = requests.get(
-    EBAY_BROWSE_SEARCH_URL,
-    headers={
-      "Authorization": f"Bearer {token}",
-      "X-EBAY-C-MARKETPLACE-ID": EBAY_MARKETPLACE_ID,
-    },
-    params=params,
-    timeout=30,
-  )
+  wait_for_ebay_slot()  # throttle to avoid eBay "too many requests"
+  with EBAY_SEMAPHORE:
+    resp = _http.get(
+      EBAY_BROWSE_SEARCH_URL,
+      headers={
+        "Authorization": f"Bearer {token}",
+        "X-EBAY-C-MARKETPLACE-ID": EBAY_MARKETPLACE_ID,
+      },
+      params=params,
+      timeout=30,
+    )
+  if resp.status_code == 401:
+    invalidate_token()  # expired or revoked; the next call fetches a new one
   if not resp.ok:
     raise RuntimeError(f"eBay search failed: {resp.status_code} {resp.text[:200]}")
 
-  data = resp.json()
+  data = orjson.loads(resp.content)
   item_summaries = data.get("itemSummaries", []) or []
   listings = []
-  prices = []
+  min_val = math.inf
+  max_val = -math.inf
   currency = None
 
   for item in item_summaries:
@@ -216,7 +459,11 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
       val_f = float(value)
     except (TypeError, ValueError):
       continue
-    prices.append(val_f)
+    # Running min/max in the same pass as building the listings
+    if val_f < min_val:
+      min_val = val_f
+    if val_f > max_val:
+      max_val = val_f
     currency = currency or cur
     listings.append(
       {
@@ -229,7 +476,7 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
       }
     )
 
-  if not prices:
+  if not listings:
     return {
       "listings": [],
       "total": 0,
@@ -238,8 +485,6 @@ def search_ebay_current_listings(query: str, limit: int = 5) -> dict:
       "currency": None,
     }
 
-  min_val = min(prices)
-  max_val = max(prices)
   total = data.get("total") or len(listings)
   return {
     "listings": listings,
@@ -264,7 +509,7 @@ def get_ebay_browse_remaining() -> int:
   """
   try:
     token = get_ebay_access_token()
-    resp = requests.get(
+    resp = _http.get(
       EBAY_RATE_LIMIT_URL,
       headers={"Authorization": f"Bearer {token}"},
       params=BROWSE_PARAMS,
@@ -272,16 +517,7 @@ def get_ebay_browse_remaining() -> int:
     )
     if resp.status_code == 204 or not resp.ok:
       return 0
-    data = resp.json()
-    rate_limits = data.get("rateLimits") or []
-    remaining = None
-    for api in rate_limits:
-      for res in api.get("resources") or []:
-        for rate in res.get("rates") or []:
-          r = rate.get("remaining")
-          if r is not None:
-            remaining = min(remaining, r) if remaining is not None else r
-    return int(remaining) if remaining is not None else 0
+    return parse_browse_remaining(orjson.loads(resp.content))
   except Exception as e:
     print(f"[VintedPy] Rate limit check failed: {e}")
     return 0
@@ -290,24 +526,22 @@ def get_ebay_browse_remaining() -> int:
 def save_vinted_last_update(now) -> None:
   """Write vintedLastUpdate to scraper_metadata in DB (only when scrape ran)."""
   try:
-    client = MongoClient(MONGODB_URI)
-    db = client[MONGO_DB_NAME]
+    db = get_mongo_client()[MONGO_DB_NAME]
     meta_col = db[MONGO_METADATA_COLLECTION]
     meta_col.update_one(
       {"_id": "status"},
       {"$set": {"vintedLastUpdate": now, "updatedAt": now}},
       upsert=True,
     )
-    client.close()
   except Exception as e:
     print(f"[VintedPy] Failed to save vintedLastUpdate: {e}")
 
 
-def fetch_vinted_page_html(driver: webdriver.Chrome, page_num: int) -> BeautifulSoup:
+def load_vinted_page_source(driver: webdriver.Chrome, page_num: int) -> str:
   """
   Load the public catalog HTML page like:
   https://www.vinted.es/catalog?search_text=sport%20card&page=2
-  and return a BeautifulSoup object for parsing.
+  and return the rendered HTML.
   Retries once on timeout (page load or read timeout).
   """
   params = {
@@ -326,13 +560,49 @@ def fetch_vinted_page_html(driver: webdriver.Chrome, page_num: int) -> Beautiful
         time.sleep(5)
         continue
       raise
-  # Give the page some time to render dynamic content
-  time.sleep(3)
-  html = driver.page_source
-  return BeautifulSoup(html, "html.parser")
+  # Wait until the first card has rendered instead of a fixed sleep; on pages
+  # without cards (past the last page) give up after VINTED_CARDS_WAIT seconds
+  try:
+    WebDriverWait(driver, VINTED_CARDS_WAIT).until(
+      EC.presence_of_element_located((By.CSS_SELECTOR, "div.new-item-box__container"))
+    )
+  except TimeoutException:
+    time.sleep(1)
+  return driver.page_source
+
+
+def _prime_vinted_session() -> None:
+  """Load the home page so Vinted sets the session cookies its API requires."""
+  _vinted_http.cookies.clear()
+  resp = _vinted_http.get(BASE_URL, timeout=30)
+  resp.raise_for_status()
+
 
+def card_from_api_item(raw: dict) -> dict:
+  """Map one catalog API item to the dict shape parse_vinted_cards returns."""
+  item = normalize_item(raw, require_year=False)
+  item["full_title"] = item["title"]
+  item["price_text"] = item.pop("price")
+  item["price_incl_text"] = item.pop("price_incl_protection")
+  return item
 
-def parse_vinted_cards(soup: BeautifulSoup) -> list[dict]:
+
+def fetch_vinted_api_items(page_num: int) -> list[dict]:
+  """
+  Fetch one catalog page from /api/v2/catalog/items (same search as the
+  HTML catalog) and return it in parse_vinted_cards' format.
+  Raises on any HTTP error so the caller can fall back to the browser.
+  """
+  resp = _vinted_http.get(
+    CATALOG_API_URL,
+    params={"search_text": VINTED_SEARCH, "page": str(page_num)},
+    timeout=30,
+  )
+  resp.raise_for_status()
+  return [card_from_api_item(raw) for raw in orjson.loads(resp.content).get("items") or []]
+
+
+def parse_vinted_cards(html: str) -> list[dict]:
   """
   Parse Vinted catalog cards from the rendered HTML.
 
@@ -354,59 +624,67 @@ def parse_vinted_cards(soup: BeautifulSoup) -> list[dict]:
       </div>
     </div>
   """
+  tree = LexborHTMLParser(html)
   items: list[dict] = []
 
-  for container in soup.select("div.new-item-box__container"):
-    data_id = container.get("data-testid") or ""
-    m_id = re.search(r"product-item-id-(\d+)", data_id)
+  for container in tree.css(_SEL_CARD):
+    data_id = container.attributes.get("data-testid") or ""
+    m_id = _PRODUCT_ID_RE.search(data_id)
     item_id = int(m_id.group(1)) if m_id else None
 
-    overlay = container.select_one("a.new-item-box__overlay")
-    if not overlay:
+    overlay = container.css_first(_SEL_OVERLAY)
+    if overlay is None:
       continue
 
-    href = overlay.get("href") or ""
+    href = overlay.attributes.get("href") or ""
     url = href if href.startswith("http") else urljoin(BASE_URL, href)
 
-    raw_title = overlay.get("title") or ""
+    raw_title = overlay.attributes.get("title") or ""
 
-    # Logical title: part before ", marca:" if present
-    if ", marca:" in raw_title:
-      title = raw_title.split(", marca:", 1)[0].strip()
+    # Exact data-testid matches when we have the id; suffix matches otherwise
+    if item_id is not None:
+      sel_brand = _SEL_BRAND_ID.format(id=item_id)
+      sel_cond = _SEL_COND_ID.format(id=item_id)
+      sel_price = _SEL_PRICE_ID.format(id=item_id)
+      sel_img = _SEL_IMG_ID.format(id=item_id)
     else:
-      title = raw_title.strip()
-
-    # Brand and condition from description
-    brand_el = container.select_one("p[data-testid$='--description-title']")
-    brand = brand_el.get_text(strip=True) if brand_el else ""
-
-    cond_el = container.select_one("p[data-testid$='--description-subtitle']")
-    condition = cond_el.get_text(strip=True) if cond_el else ""
-
-    # Base price and price incl. protection
-    price_el = container.select_one("p[data-testid$='--price-text']")
-    price_text = price_el.get_text(strip=True) if price_el else ""
-
-    # Also parse from the overlay title: two price amounts, first = base, second = incl.
-    matches = re.findall(r"\d+[.,]\d{2}\s*€", raw_title)
-    price_incl_text = ""
-    if matches:
-      # Use first as base price if price_text empty, last as price incl.
-      if not price_text:
-        price_text = matches[0].strip()
-      price_incl_text = matches[-1].strip()
+      sel_brand, sel_cond, sel_price, sel_img = _SEL_BRAND, _SEL_COND, _SEL_PRICE, _SEL_IMG
+
+    # Brand, condition and base price from the description
+    brand = _text(container.css_first(sel_brand))
+    condition = _text(container.css_first(sel_cond))
+    price_text = _text(container.css_first(sel_price))
+
+    m = _OVERLAY_RE.match(raw_title)
+    if m:
+      title = m["title"].strip()
+      brand = brand or (m["brand"] or "").strip()
+      condition = condition or (m["cond"] or "").strip()
+      price_text = price_text or f"{m['base']} €"
+      price_incl_text = f"{m['incl']} €"
+    else:
+      # Logical title: part before ", marca:" if present
+      idx = raw_title.find(", marca:")
+      title = raw_title[:idx].strip() if idx >= 0 else raw_title.strip()
+
+      # Also parse from the overlay title: two price amounts, first = base, second = incl.
+      matches = _PRICE_EUR_RE.findall(raw_title)
+      price_incl_text = ""
+      if matches:
+        # Use first as base price if price_text empty, last as price incl.
+        if not price_text:
+          price_text = matches[0].strip()
+        price_incl_text = matches[-1].strip()
 
     # Likes from favourite-count-text span
     likes = 0
-    likes_el = container.select_one("span[data-testid='favourite-count-text']")
-    if likes_el:
-      txt = likes_el.get_text(strip=True)
-      if txt.isdigit():
-        likes = int(txt)
+    txt = _text(container.css_first(_SEL_LIKES))
+    if txt.isdigit():
+      likes = int(txt)
 
     # Photo URL
-    img_el = container.select_one("img[data-testid$='--image--img']")
-    photo_url = img_el.get("src") if img_el and img_el.get("src") else ""
+    img_el = container.css_first(sel_img)
+    photo_url = (img_el.attributes.get("src") or "") if img_el is not None else ""
 
     items.append(
       {
@@ -426,7 +704,7 @@ def parse_vinted_cards(soup: BeautifulSoup) -> list[dict]:
   return items
 
 
-def normalize_item(raw: dict) -> dict:
+def normalize_item(raw: dict, require_year: bool = True) -> dict:
   photos = raw.get("photos") or []
   main_photo = (photos[0] or {}) if photos else (raw.get("photo") or {})
 
@@ -448,7 +726,9 @@ def normalize_item(raw: dict) -> dict:
     or conversion.get("buyer_price")
     or conversion.get("total_buyer_price")
   )
-  total_currency = conversion.get("buyer_currency") or (price and price.get("currency_code"))
+  total_currency = conversion.get("buyer_currency") or (
+    price.get("currency_code") if isinstance(price, dict) else None
+  )
   price_incl = ""
   if total_price is not None and total_currency:
     if isinstance(total_price, dict):
@@ -467,7 +747,7 @@ def normalize_item(raw: dict) -> dict:
     or ""
   )
 
-  if not title_has_year(raw.get("title", "")):
+  if require_year and not title_has_year(raw.get("title", "")):
     return {}
 
   return {
@@ -484,103 +764,310 @@ def normalize_item(raw: dict) -> dict:
   }
 
 
+def _ebay_cache_key(title: str) -> str:
+  """Same card listed by different sellers: ignore case, punctuation and word order."""
+  return " ".join(sorted(_NON_ALNUM_RE.sub(" ", title.lower()).split()))[:200]
+
+
+def _fetch_ebay_for(title: str, cache_col=None) -> dict:
+  """
+  eBay results for a Vinted title, from the in-process cache, then the Mongo
+  cache collection (if given), then the Browse API.
+  """
+  key = _ebay_cache_key(title)
+  with _ebay_cache_lock:
+    cached = _ebay_cache.get(key)
+  if cached is not None:
+    return cached
+
+  if cache_col is not None:
+    try:
+      doc = cache_col.find_one({"_id": key}, {"result": 1})
+    except Exception as e:
+      print(f"      -> eBay cache lookup failed: {e}")
+      doc = None
+    if doc and doc.get("result") is not None:
+      with _ebay_cache_lock:
+        _ebay_cache[key] = doc["result"]
+      return doc["result"]
+
+  result = search_ebay_current_listings(title[:200], limit=5)
+  with _ebay_cache_lock:
+    _ebay_cache[key] = result
+  if cache_col is not None:
+    try:
+      cache_col.replace_one(
+        {"_id": key},
+        {"result": result, "createdAt": datetime.now(timezone.utc)},
+        upsert=True,
+      )
+    except Exception as e:
+      print(f"      -> eBay cache write failed: {e}")
+  return result
+
+
+def _start_browser_session() -> webdriver.Chrome:
+  driver = get_driver()
+
+  # The driver is reused across cycles; start each one with fresh cookies
+  try:
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+  except Exception as e:
+    print(f"[VintedPy] Could not clear browser cookies: {e}")
+
+  # Open home once so cookies/session are initialized
+  driver.get(BASE_URL)
+  try:
+    WebDriverWait(driver, VINTED_CARDS_WAIT).until(
+      lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+  except TimeoutException:
+    pass
+  return driver
+
+
+def _init_browser_worker(counter, chromedriver_path: str) -> None:
+  """Pool initializer: stagger worker start-up and quit Chrome when the worker exits."""
+  global _worker_chromedriver_path
+  _worker_chromedriver_path = chromedriver_path
+  with counter.get_lock():
+    index = counter.value
+    counter.value += 1
+  # Workers exit through multiprocessing, which skips atexit handlers
+  multiprocessing.util.Finalize(None, close_driver, exitpriority=10)
+  # 100 ms apart so the workers' first page loads don't hit Vinted in one burst
+  time.sleep(0.1 * index)
+
+
+def _fetch_page_in_worker(cycle: float, page_num: int) -> str:
+  """Pool task: load one catalog page in this worker's own Chrome and return the HTML."""
+  global _worker_cycle
+  try:
+    driver = get_driver()
+    if _worker_cycle != cycle:
+      driver = _start_browser_session()
+      _worker_cycle = cycle
+    return load_vinted_page_source(driver, page_num)
+  except WebDriverException:
+    # Broken session: the next task starts a fresh browser (and session)
+    close_driver()
+    _worker_cycle = None
+    raise
+
+
+def _get_browser_pool() -> multiprocessing.pool.Pool:
+  """
+  Return the browser worker pool, starting it on first use. Selenium drivers
+  aren't safe to share, so each worker process owns one; the pool (and its
+  browsers) stays up between cycles and is shut down at exit.
+  """
+  global _browser_pool
+  if _browser_pool is None:
+    # Resolve chromedriver here, once, so the workers don't all run
+    # ChromeDriverManager into the same cache at the same time
+    chromedriver_path = _chromedriver_path()
+    # spawn: forking a process that already runs threads and sockets is unsafe
+    ctx = multiprocessing.get_context("spawn")
+    _browser_pool = ctx.Pool(
+      processes=VINTED_BROWSER_WORKERS,
+      initializer=_init_browser_worker,
+      initargs=(ctx.Value("i", 0), chromedriver_path),
+    )
+  return _browser_pool
+
+
+def close_browser_pool() -> None:
+  global _browser_pool
+  if _browser_pool is None:
+    return
+  _browser_pool.close()
+  _browser_pool.join()
+  _browser_pool = None
+
+
+atexit.register(close_browser_pool)
+
+
+def iter_browser_pages(cycle: float, first_page: int):
+  """
+  Yield (page_num, AsyncResult) for catalog pages from first_page on, in page
+  order. At most VINTED_BROWSER_WORKERS pages are in flight, so stopping early
+  wastes only the pages already being loaded.
+  """
+  pool = _get_browser_pool()
+  pending = deque()
+  next_page = first_page
+  while pending or next_page <= VINTED_MAX_PAGES:
+    while next_page <= VINTED_MAX_PAGES and len(pending) < VINTED_BROWSER_WORKERS:
+      pending.append((next_page, pool.apply_async(_fetch_page_in_worker, (cycle, next_page))))
+      next_page += 1
+    yield pending.popleft()
+
+
 def scrape_once():
-  client = MongoClient(MONGODB_URI)
-  db = client[MONGO_DB_NAME]
+  db = get_mongo_client()[MONGO_DB_NAME]
   col = db[MONGO_COLLECTION]
+  # Same unique index as the Mongoose Item model; makes upsert lookups by id cheap
+  try:
+    col.create_index("id", unique=True)
+  except Exception as e:
+    print(f"[VintedPy] Could not ensure index on id: {e}")
+  cache_col = db[EBAY_CACHE_COLLECTION]
+  try:
+    cache_col.create_index("createdAt", expireAfterSeconds=EBAY_CACHE_TTL)
+  except Exception as e:
+    print(f"[VintedPy] Could not ensure TTL index on {EBAY_CACHE_COLLECTION}: {e}")
 
-  driver = create_driver()
   upserted = 0
-  try:
-    # Open home once so cookies/session are initialized
-    driver.get(BASE_URL)
-    time.sleep(3)
 
+  use_api = not VINTED_USE_BROWSER
+  if use_api:
+    try:
+      _prime_vinted_session()
+    except Exception as e:
+      print(f"[VintedPy] Could not open a Vinted HTTP session ({e}); using the browser")
+      use_api = False
+  # Browser pages are loaded ahead by the worker pool; each cycle gets its own
+  # id so workers know to start a fresh browser session
+  cycle = time.time()
+  browser_pages = None
+
+  # eBay lookups for a page run in parallel (rate-limited in
+  # search_ebay_current_listings); one pool is shared by all pages
+  with ThreadPoolExecutor(max_workers=EBAY_WORKERS) as executor:
     for page_num in range(1, VINTED_MAX_PAGES + 1):
       print(f"[VintedPy] Page {page_num}/{VINTED_MAX_PAGES}")
-      try:
-        soup = fetch_vinted_page_html(driver, page_num)
-      except Exception as e:
-        print(f"[VintedPy] error on page {page_num}: {e}")
-        break
+      if use_api:
+        try:
+          items = fetch_vinted_api_items(page_num)
+        except Exception as e:
+          print(f"[VintedPy] Catalog API failed ({e}); switching to the browser")
+          use_api = False
+      if not use_api:
+        if browser_pages is None:
+          browser_pages = iter_browser_pages(cycle, page_num)
+        try:
+          _, result = next(browser_pages)
+          html = result.get()
+        except Exception as e:
+          print(f"[VintedPy] error on page {page_num}: {e}")
+          if isinstance(e, SessionNotCreatedException):
+            # The workers' chromedriver doesn't match Chrome: resolve it again
+            # and start a new pool next cycle
+            _forget_chromedriver_path()
+            close_browser_pool()
+          break
+        items = parse_vinted_cards(html)
 
-      items = parse_vinted_cards(soup)
       if not items:
         print("[VintedPy] No more items, stopping.")
         break
 
       liked = [raw for raw in items if (raw.get("likes") or 0) >= VINTED_MIN_LIKES]
-      print(f"  {len(items)} raw, {len(liked)} with likes >= {VINTED_MIN_LIKES}")
       if not liked:
+        print(f"  {len(items)} raw, none with likes >= {VINTED_MIN_LIKES}")
         break
-
-      saved_this_page = 0
-
-      for raw in liked:
+      # Only titles with a year can be matched on eBay; drop the rest up front
+      dated = [raw for raw in liked if _YEAR_RE.search(raw.get("title") or "")]
+      print(
+        f"  {len(items)} raw, {len(liked)} with likes >= {VINTED_MIN_LIKES}, "
+        f"{len(dated)} with a year in the title"
+      )
+
+      candidates = []
+      for raw in dated:
         title = (raw.get("title") or "").strip()
         likes = raw.get("likes", 0)
         print(f"    [LIKED] '{title}' – likes={likes}")
 
-        if not title_has_year(title):
-          print("      -> skipped: title has no valid year")
-          continue
-
         # Derive an ID (prefer parsed id, fallback to URL)
         item_id = raw.get("id")
         if not item_id:
-          m = re.search(r"/items/(\d+)", raw.get("url") or "")
+          m = _ITEMS_URL_RE.search(raw.get("url") or "")
           if m:
             item_id = int(m.group(1))
           else:
             print("      -> skipped: could not derive numeric ID from URL")
             continue
 
-        # Fetch eBay data; skip if no matches
-        try:
-          ebay = search_ebay_current_listings(title[:200], limit=5)
-        except Exception as e:
-          print(f"      -> eBay error for '{title}': {e}")
-          continue
-        if not ebay.get("listings"):
-          print("      -> skipped: no eBay listings found")
+        candidates.append((raw, title, item_id))
+
+      # One query for the page tells us which items were refreshed recently
+      fresh = set()
+      if candidates:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=VINTED_REFRESH_HOURS)
+        for d in col.find(
+          {"id": {"$in": [item_id for _, _, item_id in candidates]}},
+          {"id": 1, "updatedAt": 1},
+        ):
+          updated = d.get("updatedAt")
+          if updated is None:
+            continue
+          if updated.tzinfo is None:  # pymongo returns naive UTC datetimes
+            updated = updated.replace(tzinfo=timezone.utc)
+          if updated > cutoff:
+            fresh.add(d["id"])
+
+      futures = {}
+      # Near-identical titles on one page share a single lookup
+      lookups = {}
+      for raw, title, item_id in candidates:
+        if item_id in fresh:
+          print(f"      -> skipped '{title}': refreshed within {VINTED_REFRESH_HOURS:g}h")
           continue
+        key = _ebay_cache_key(title)
+        if key not in lookups:
+          lookups[key] = executor.submit(_fetch_ebay_for, title, cache_col)
+        futures.setdefault(lookups[key], []).append((raw, title, item_id))
+
+      ops = []
+      for future in as_completed(futures):
+        for raw, title, item_id in futures[future]:
+          # Fetch eBay data; skip if no matches
+          try:
+            ebay = future.result()
+          except Exception as e:
+            print(f"      -> eBay error for '{title}': {e}")
+            continue
+          if not ebay.get("listings"):
+            print(f"      -> skipped '{title}': no eBay listings found")
+            continue
 
-        now = datetime.now(timezone.utc)
-        doc = {
-          "id": item_id,
-          "title": title,
-          "price": raw.get("price_text", ""),
-          "price_incl_protection": raw.get("price_incl_text") or raw.get("price_text", ""),
-          "url": raw.get("url", ""),
-          "photo_url": raw.get("photo_url", ""),
-          "brand": raw.get("brand", ""),
-          "condition": raw.get("condition", ""),
-          "likes": int(likes or 0),
-          "source": "vinted",
-          "ebay_from": ebay.get("minPrice"),
-          "ebay_to": ebay.get("maxPrice"),
-          "ebay_count": ebay.get("total"),
-          "ebay_link": build_ebay_link(title),
-          "updatedAt": now,
-        }
-
-        col.update_one(
-          {"id": item_id},
-          {"$set": doc, "$setOnInsert": {"createdAt": now}},
-          upsert=True,
-        )
-        saved_this_page += 1
-        upserted += 1
-
-      print(f"  -> saved {saved_this_page} items on this page with eBay matches")
+          now = datetime.now(timezone.utc)
+          doc = {
+            "id": item_id,
+            "title": title,
+            "price": raw.get("price_text", ""),
+            "price_incl_protection": raw.get("price_incl_text") or raw.get("price_text", ""),
+            "url": raw.get("url", ""),
+            "photo_url": raw.get("photo_url", ""),
+            "brand": raw.get("brand", ""),
+            "condition": raw.get("condition", ""),
+            "likes": int(raw.get("likes", 0) or 0),
+            "source": "vinted",
+            "ebay_from": ebay.get("minPrice"),
+            "ebay_to": ebay.get("maxPrice"),
+            "ebay_count": ebay.get("total"),
+            "ebay_link": build_ebay_link(title),
+            "updatedAt": now,
+          }
+
+          ops.append(
+            UpdateOne(
+              {"id": item_id},
+              {"$set": doc, "$setOnInsert": {"createdAt": now}},
+              upsert=True,
+            )
+          )
+
+      # One round-trip for the whole page instead of one per item
+      if ops:
+        col.bulk_write(ops, ordered=False)
+        upserted += len(ops)
+      print(f"  -> saved {len(ops)} items on this page with eBay matches")
 
       # small polite delay between pages
       time.sleep(2 + 1 * (page_num % 3))
-  finally:
-    try:
-      driver.quit()
-    except Exception:
-      pass
 
   print(f"[VintedPy] Upserted {upserted} Vinted items into MongoDB")
 